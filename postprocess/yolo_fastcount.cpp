@@ -0,0 +1,33 @@
+/**
+ * @file yolo_fastcount.cpp
+ * Minimal hailofilter postprocess for pipeline branches nobody displays:
+ * counts the boxes left by on-device NMS and attaches the total as a single
+ * HailoUserMeta instead of one HailoDetection per box. hailonet's
+ * nms-score-threshold has already dropped low-score boxes, so no re-filtering.
+ **/
+
+#include "hailo_objects.hpp"
+#include "hailo/hailort.h"
+
+extern "C" void yolo_fastcount(HailoROIPtr roi)
+{
+    uint32_t count = 0;
+
+    for (auto &tensor : roi->get_tensors()) {
+        const hailo_vstream_info_t &info = tensor->vstream_info();
+        if (info.format.order != HAILO_FORMAT_ORDER_HAILO_NMS) {
+            continue;
+        }
+
+        // Same float32 NMS-by-class layout as parse_nms_data in utils.cpp
+        uint8_t *data = tensor->data();
+        size_t offset = 0;
+        for (size_t class_id = 0; class_id < info.nms_shape.number_of_classes; class_id++) {
+            auto det_count = static_cast<uint32_t>(*reinterpret_cast<float32_t*>(data + offset));
+            offset += sizeof(float32_t) + det_count * sizeof(hailo_bbox_float32_t);
+            count += det_count;
+        }
+    }
+
+    roi->add_object(std::make_shared<HailoUserMeta>(static_cast<int>(count), "fastcount", 0.0f));
+}
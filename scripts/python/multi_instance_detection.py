@@ -8,107 +8,185 @@ Updated to use YOLOv11l model as outlined in Hailo Model Zoo.
 import os
 import time
 import threading
+import traceback
+import multiprocessing
 from pathlib import Path
+import numpy as np
 import gi
 gi.require_version('Gst', '1.0')
 from gi.repository import Gst
 import hailo
 from hailo_apps.hailo_app_python.core.gstreamer.gstreamer_app import app_callback_class
 from hailo_apps.hailo_app_python.apps.detection_simple.detection_pipeline_simple import GStreamerDetectionApp
+from hailo_apps.hailo_app_python.core.gstreamer.gstreamer_helper_pipelines import (
+    SOURCE_PIPELINE,
+    INFERENCE_PIPELINE,
+    USER_CALLBACK_PIPELINE,
+    QUEUE
+)
+from _fpskernel import fps_from_times, warm_up as warm_up_fps_kernel
+
+# hailo lookups used by the probe, resolved once at import
+_get_roi = hailo.get_roi_from_buffer
+_DET = hailo.HAILO_DETECTION
+
+# Number of frame timestamps used for the current FPS estimate
+FPS_WINDOW = 60
+
+# Per-instance stats are kept struct-of-arrays style: one shared array per
+# field, indexed by instance id, written by the probes and read by the monitor
+MAX_INSTANCES = 8
+# COCO-80 class ids, with a spare slot since hailo class ids may start at 1
+NUM_CLASSES = 81
+# Bytes kept of each instance's last probe error message
+ERR_MSG_LEN = 200
+STATS_FIELDS = {
+    "counts": (np.int64, (MAX_INSTANCES,)),       # frames processed
+    "fps": (np.float64, (MAX_INSTANCES,)),        # current FPS
+    "det": (np.int64, (MAX_INSTANCES,)),          # detections in the last frame
+    "total_det": (np.int64, (MAX_INSTANCES,)),    # detections since start
+    "start": (np.float64, (MAX_INSTANCES,)),      # time.monotonic() at start, 0 if the slot is unused
+    "class_counts": (np.int64, (MAX_INSTANCES, NUM_CLASSES)),  # sampled detections per class id
+    "err": (np.int64, (MAX_INSTANCES,)),          # detection parsing errors in the probe
+    "err_msg": (np.uint8, (MAX_INSTANCES, ERR_MSG_LEN)),  # last error message, NUL-padded UTF-8
+}
+
+def create_shared_stats(ctx=multiprocessing):
+    """Allocate the shared stats arrays, in the parent before instances are spawned"""
+    return {
+        name: ctx.RawArray(np.ctypeslib.as_ctypes_type(dtype), int(np.prod(shape)))
+        for name, (dtype, shape) in STATS_FIELDS.items()
+    }
+
+def stats_views(shared_stats):
+    """Wrap the shared stats arrays as numpy views"""
+    views = {}
+    for name, raw in shared_stats.items():
+        dtype, shape = STATS_FIELDS[name]
+        views[name] = np.frombuffer(raw, dtype=dtype).reshape(shape)
+    return views
 
 # Enhanced callback class with better FPS tracking per instance
 class EnhancedInstanceCallback(app_callback_class):
     """Enhanced callback class with accurate FPS tracking for each instance"""
     
-    def __init__(self, instance_id):
+    def __init__(self, instance_id, stats):
         super().__init__()
         self.instance_id = instance_id
-        self.start_time = time.time()
-        self.last_fps_time = time.time()
-        self.fps_frame_count = 0
-        self.current_fps = 0.0
-        self.detection_count = 0
-        self.total_detections = 0
-        self.frame_times = []
+        # Slot in the shared stats arrays
+        self._idx = instance_id
+        self._counts = stats["counts"]
+        self._curfps = stats["fps"]
+        self._det = stats["det"]
+        self._totdet = stats["total_det"]
+        self._class_counts = stats["class_counts"][instance_id]
+        self._err = stats["err"]
+        stats["start"][instance_id] = time.monotonic()
+        # Preallocated ring buffer of the last FPS_WINDOW frame timestamps (s)
+        self.frame_times = np.empty(FPS_WINDOW, dtype=np.float64)
+        self.head = 0
+        # Probe errors are counted in the stats arrays; the message is kept locally
+        # and copied into the shared message slot only when it changes
+        self._err_msg = stats["err_msg"][instance_id]
+        self.last_err = ""
+        # Enumerate detections on 1 in N frames only (DET_SAMPLE_EVERY). N > 1 saves
+        # the per-detection wrapper allocations at the cost of the detection totals
+        # becoming an estimate (sampled counts scaled by N).
+        # Clamped to 1 so 0 or a negative value can't break the modulo/scaling
+        self._sample_every = max(1, int(os.environ.get("DET_SAMPLE_EVERY", "1")))
+        
+    def set_last_err(self, message):
+        """Keep the last probe error and copy it into this slot's shared message buffer"""
+        self.last_err = message
+        encoded = message.encode(errors="replace")[:ERR_MSG_LEN]
+        self._err_msg[:] = 0
+        self._err_msg[:len(encoded)] = np.frombuffer(encoded, dtype=np.uint8)
         
     def calculate_fps(self):
         """Calculate accurate FPS"""
-        current_time = time.time()
-        self.frame_times.append(current_time)
-        
-        # Keep only last 60 frames for calculation
-        if len(self.frame_times) > 60:
-            self.frame_times.pop(0)
-            
-        # Calculate FPS from frame times
-        if len(self.frame_times) >= 2:
-            time_span = self.frame_times[-1] - self.frame_times[0]
-            if time_span > 0:
-                self.current_fps = (len(self.frame_times) - 1) / time_span
-                
-        return self.current_fps
-
-# Global storage for callback instances
-instance_callbacks = {}
+        self.frame_times[self.head % FPS_WINDOW] = time.monotonic()
+        self.head += 1
+        fps = fps_from_times(self.frame_times, self.head, FPS_WINDOW)
+        self._curfps[self._idx] = fps
+        return fps
 
 # Enhanced callback function factory
-def create_enhanced_callback(instance_id):
+def create_enhanced_callback(user_data):
     """Create an enhanced callback function for specific instance"""
-    def enhanced_callback(pad, info, user_data):
-        user_data.increment()
-        fps = user_data.calculate_fps()
+    # Bind everything the probe touches to closure cells/default args so the hot
+    # path uses LOAD_DEREF/LOAD_FAST instead of attribute and global lookups
+    idx = user_data._idx
+    counts = user_data._counts
+    det = user_data._det
+    totdet = user_data._totdet
+    class_counts = user_data._class_counts
+    err = user_data._err
+    calculate_fps = user_data.calculate_fps
+    sample_every = user_data._sample_every
+    
+    def enhanced_callback(pad, info, user_data,
+                          _roi=_get_roi,
+                          _typed=_DET,
+                          _ok=Gst.PadProbeReturn.OK):
+        # Hot path: only update counters here, all formatting and printing
+        # is done by the monitoring thread
+        counts[idx] += 1
+        calculate_fps()
+        
+        # Skip detection enumeration on non-sampled frames
+        if counts[idx] % sample_every != 0:
+            return _ok
         
         # Process detections
         buffer = info.get_buffer()
         if buffer is None:
-            return Gst.PadProbeReturn.OK
+            return _ok
             
-        detections_this_frame = []
+        # Count only - no per-detection label/confidence string formatting
+        n = 0
         try:
-            roi = hailo.get_roi_from_buffer(buffer)
-            for detection in roi.get_objects_typed(hailo.HAILO_DETECTION):
-                label = detection.get_label()
-                confidence = detection.get_confidence()
-                detections_this_frame.append(f"{label}: {confidence:.2f}")
-                user_data.total_detections += 1
+            for detection in _roi(buffer).get_objects_typed(_typed):
+                n += 1
+                class_counts[detection.get_class_id()] += 1
         except Exception as e:
-            if user_data.get_count() % 100 == 0:  # Only print error occasionally
-                print(f"Instance {instance_id}: Detection error: {e}")
+            err[idx] += 1
+            message = repr(e)
+            if message != user_data.last_err:
+                user_data.set_last_err(message)
                 
-        user_data.detection_count = len(detections_this_frame)
-        
-        # Print comprehensive status every 90 frames
-        if user_data.get_count() % 90 == 0:
-            runtime = time.time() - user_data.start_time
-            avg_fps = user_data.get_count() / runtime if runtime > 0 else 0
-            
-            print(f"🔍 Instance {instance_id}: Frame {user_data.get_count():6d} | "
-                  f"FPS: {fps:5.1f} | Avg: {avg_fps:5.1f} | "
-                  f"Detections: {user_data.detection_count:2d} | "
-                  f"Total: {user_data.total_detections:6d}")
+        # Exact for the sampled frame, scaled estimate for the running total
+        det[idx] = n
+        totdet[idx] += n * sample_every
                   
-        return Gst.PadProbeReturn.OK
+        return _ok
         
     return enhanced_callback
 
 class YOLOv11lDetectionApp(GStreamerDetectionApp):
     """Enhanced detection app specifically configured for YOLOv11l"""
     
-    def __init__(self, instance_id=0):
+    # True when every instance's hailonet lives in this one process
+    in_process = False
+    
+    def __init__(self, instance_id=0, stats=None):
         self.instance_id = instance_id
         
-        # Create enhanced callback for this instance
-        user_data = EnhancedInstanceCallback(instance_id)
-        app_callback = create_enhanced_callback(instance_id)
+        # Standalone use gets private stats arrays
+        if stats is None:
+            stats = stats_views(create_shared_stats())
         
-        # Store globally for monitoring
-        instance_callbacks[instance_id] = user_data
+        # Create enhanced callback for this instance
+        user_data = EnhancedInstanceCallback(instance_id, stats)
+        app_callback = create_enhanced_callback(user_data)
         
-        # Initialize parent with our callback
+        # Initialize parent with our callback (pipeline creation is deferred, see create_pipeline)
+        self.pipeline_configured = False
         super().__init__(app_callback, user_data)
+        self.user_data = user_data
         
-        # Override model path for YOLOv11l
-        yolo11_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.onnx"
+        # Override model path for YOLOv11l, compiled for the device with:
+        #   hailomz compile yolov11l --hw-arch hailo8
+        yolo11_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.hef"
         if os.path.exists(yolo11_path):
             self.hef_path = yolo11_path
             print(f"✅ Instance {instance_id}: Using YOLOv11l model: {yolo11_path}")
@@ -116,108 +194,317 @@ class YOLOv11lDetectionApp(GStreamerDetectionApp):
             print(f"⚠️  Instance {instance_id}: YOLOv11l not found, using default model: {self.hef_path}")
         
         # Configure for YOLOv11l (larger model, different thresholds)
-        self.batch_size = 1  # YOLOv11l works best with batch size 1
+        # Batching amortizes the per-frame device round-trip; tune with HAILO_BATCH
+        self.batch_size = int(os.environ.get("HAILO_BATCH", "8"))
+        
+        # A vdevice group only spans hailonets in one process, so instances share a
+        # group (multiplexed by the HailoRT scheduler) in the shared-source pipeline,
+        # or across processes with HAILO_MPS=1, which needs the hailort service
+        # running. HAILO_VGROUP=<id> picks the group, HAILO_VGROUP=per-instance
+        # always uses one group per instance.
+        self.vgroup = os.environ.get("HAILO_VGROUP", "1")
+        self.multi_process_service = bool(os.environ.get("HAILO_MPS"))
         
         # Updated thresholds for YOLOv11l
         nms_score_threshold = 0.25  # Lower threshold for YOLOv11l
         nms_iou_threshold = 0.45
         
+        # On-device NMS output comes as float32 (or uint16), and the hailortpp
+        # postprocess walks the float32 NMS-by-class layout; HAILO_OUT=uint8 is
+        # only for HEFs without on-device NMS
+        output_format = os.environ.get("HAILO_OUT", "float32").upper()
+        
         self.thresholds_str = (
             f"nms-score-threshold={nms_score_threshold} "
             f"nms-iou-threshold={nms_iou_threshold} "
-            f"output-format-type=HAILO_FORMAT_TYPE_FLOAT32"
+            f"output-format-type=HAILO_FORMAT_TYPE_{output_format}"
         )
         
-        print(f"🎯 Instance {instance_id}: Configured with thresholds - Score: {nms_score_threshold}, IoU: {nms_iou_threshold}")
+        print(f"🎯 Instance {instance_id}: Configured with thresholds - Score: {nms_score_threshold}, IoU: {nms_iou_threshold}, "
+              f"Batch size: {self.batch_size}")
+        
+        # Now that the overrides above are in place, build the pipeline
+        self.pipeline_configured = True
+        self.create_pipeline()
+        
+    def device_params(self, instance_id):
+        """hailonet vdevice group and scheduler properties for one instance"""
+        if self.vgroup == "per-instance" or not (self.in_process or self.multi_process_service):
+            return {"vdevice-group-id": instance_id + 1}
+        
+        # Shared group: round-robin scheduler interleaves the instances' networks
+        params = {
+            "vdevice-group-id": self.vgroup,
+            "scheduling-algorithm": 1,
+            "scheduler-timeout-ms": 0,
+            "scheduler-threshold": self.batch_size,
+        }
+        if self.multi_process_service:
+            params["multi-process-service"] = "true"
+        return params
+        
+    def create_pipeline(self):
+        """Create the pipeline from the unmodified base string, then configure its elements"""
+        # GStreamerDetectionApp calls this at the end of its __init__, before the
+        # YOLOv11l overrides are applied; skip that call
+        if not self.pipeline_configured:
+            return
+        
+        super().create_pipeline()
+        
+        for element in self.pipeline.iterate_recurse():
+            if element.get_factory().get_name() == "hailonet":
+                self.set_hailonet_properties(element)
+                self.tune_hailonet_queue(element)
+        
+        # Display is opt-in (SHOW_VIDEO=1, instance 0 only), everything else runs
+        # into an unsynchronized fakesink to save resources
+        if self.instance_id > 0 or not os.environ.get("SHOW_VIDEO"):
+            self.replace_display_sink()
+        
+    def set_hailonet_properties(self, hailonet):
+        """Apply batch size and device group/scheduler settings to a hailonet element"""
+        hailonet.set_property("batch-size", self.batch_size)
+        for prop, value in self.device_params(self.instance_id).items():
+            # Parse from string so enum and string-typed properties are handled alike
+            Gst.util_set_object_arg(hailonet, prop, str(value))
+        
+    def tune_hailonet_queue(self, hailonet):
+        """Make the queue feeding a hailonet leaky and deep enough for one batch"""
+        peer = hailonet.get_static_pad("sink").get_peer()
+        upstream = peer.get_parent_element() if peer else None
+        if upstream is None or upstream.get_factory().get_name() != "queue":
+            return
+        # Leaky so a stalled branch drops frames instead of back-pressuring the source
+        Gst.util_set_object_arg(upstream, "leaky", "downstream")
+        upstream.set_property("max-size-time", 0)
+        upstream.set_property("max-size-bytes", 0)
+        # Must hold at least one full batch
+        upstream.set_property("max-size-buffers", max(3, self.batch_size))
+        
+    def replace_display_sink(self):
+        """Swap the whole display branch (overlay, convert, sink) for an unsynchronized fakesink"""
+        display = self.pipeline.get_by_name("hailo_display")
+        if display is None:
+            return
+        
+        # DISPLAY_PIPELINE names every element after the sink; walk upstream
+        # through them to the element that feeds the overlay queue
+        branch = [display]
+        upstream = display.get_static_pad("sink").get_peer().get_parent_element()
+        while upstream.get_name().startswith("hailo_display"):
+            branch.append(upstream)
+            upstream = upstream.get_static_pad("sink").get_peer().get_parent_element()
+        
+        upstream.unlink(branch[-1])
+        for element in branch:
+            self.pipeline.remove(element)
+        
+        sink = Gst.ElementFactory.make("fakesink", "hailo_fakesink")
+        sink.set_property("sync", False)
+        self.pipeline.add(sink)
+        upstream.link(sink)
+
+class SharedSourceDetectionApp(YOLOv11lDetectionApp):
+    """Single source captured/decoded once and fanned out with a tee to one inference branch per instance"""
+    
+    in_process = True
+    
+    def __init__(self, num_instances, stats=None):
+        self.num_instances = num_instances
+        
+        if stats is None:
+            stats = stats_views(create_shared_stats())
+        
+        # Instance 0 is owned by the parent app, one extra callback per remaining branch
+        self.branch_user_data = [EnhancedInstanceCallback(i, stats) for i in range(1, num_instances)]
+        
+        super().__init__(0, stats)
         
     def get_pipeline_string(self):
-        """Override to add instance-specific configuration"""
-        # Get the base pipeline string
-        base_pipeline = super().get_pipeline_string()
-        
-        # Modify hailonet element to use different vdevice-group-id for each instance
-        # This enables true parallel processing on different Hailo cores
-        modified_pipeline = base_pipeline.replace(
-            'hailonet ',
-            f'hailonet vdevice-group-id={self.instance_id + 1} '
+        """Build source ! tee with one leaky-queued inference branch per instance"""
+        source_pipeline = SOURCE_PIPELINE(
+            video_source=self.video_source,
+            video_width=self.video_width,
+            video_height=self.video_height,
+            frame_rate=self.frame_rate,
+            sync=self.sync
         )
         
-        # For instances other than 0, replace display with fakesink to save resources
-        if self.instance_id > 0:
-            modified_pipeline = modified_pipeline.replace(
-                'fpsdisplaysink',
-                'fakesink sync=false'
+        pipeline_parts = [f"{source_pipeline} ! tee name=input_tee"]
+        
+        for i in range(self.num_instances):
+            inference_pipeline = INFERENCE_PIPELINE(
+                hef_path=self.hef_path,
+                post_process_so=self.post_process_so,
+                post_function_name=self.post_function_name,
+                batch_size=self.batch_size,
+                config_json=self.labels_json,
+                additional_params=self.thresholds_str + "".join(
+                    f" {prop}={value}" for prop, value in self.device_params(i).items()
+                ),
+                name=f'inference_{i}'
             )
             
-        return modified_pipeline
+            # GStreamerApp.run() attaches the instance 0 probe to "identity_callback"
+            callback_name = "identity_callback" if i == 0 else f"identity_callback_{i}"
+            
+            # Leaky queue so a slow branch drops frames instead of stalling the tee
+            branch = (
+                f"input_tee. ! "
+                f"{QUEUE(name=f'queue_to_inference_{i}', leaky='downstream', max_size_buffers=2)} ! "
+                f"{inference_pipeline} ! "
+                f"{USER_CALLBACK_PIPELINE(name=callback_name)} ! "
+                f"fakesink sync=false"
+            )
+            pipeline_parts.append(branch)
+            
+        return " ".join(pipeline_parts)
+        
+    def set_hailonet_properties(self, hailonet):
+        """Per-branch device settings are already part of the pipeline string"""
+        
+    def create_pipeline(self):
+        """Create the pipeline and attach probes for branches 1..N-1"""
+        if not self.pipeline_configured:
+            return
+        
+        super().create_pipeline()
+        
+        for user_data in self.branch_user_data:
+            identity = self.pipeline.get_by_name(f"identity_callback_{user_data.instance_id}")
+            identity.get_static_pad("src").add_probe(
+                Gst.PadProbeType.BUFFER,
+                create_enhanced_callback(user_data),
+                user_data
+            )
 
-def run_instance(instance_id):
-    """Run a single detection instance"""
+def run_instance(instance_id, shared_stats, stop_evt, barrier):
+    """Run a single detection instance in its own process"""
     try:
         print(f"🚀 Starting instance {instance_id}...")
         
+        # Pin this instance to its own core so caches stay warm
+        os.sched_setaffinity(0, {instance_id % os.cpu_count()})
+        
         # Set environment for this instance
         project_root = Path(__file__).resolve().parent.parent
         env_file = project_root / ".env"
         env_path_str = str(env_file)
         os.environ["HAILO_ENV_FILE"] = env_path_str
         
+        # GStreamer is not fork-safe once initialized, so initialize it in the child
+        Gst.init(None)
+        warm_up_fps_kernel()
+        
         # Create and run the app
-        app = YOLOv11lDetectionApp(instance_id)
+        app = YOLOv11lDetectionApp(instance_id, stats_views(shared_stats))
+        
+        # Signal main that this instance is ready; a broken barrier (another
+        # instance failed or timed out) only loses the synchronized start
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            print(f"⚠️  Instance {instance_id}: startup barrier broken, starting anyway")
         app.run()
         
     except Exception as e:
         print(f"❌ Error in instance {instance_id}: {e}")
-        import traceback
         traceback.print_exc()
+        # Don't leave main waiting for an instance that will never be ready
+        barrier.abort()
+    finally:
+        # Wake the supervisor in main()
+        stop_evt.set()
 
-def monitor_performance():
-    """Monitor and display performance statistics for all instances"""
-    def monitoring_thread():
-        print("📊 Performance monitoring started...")
-        time.sleep(5)  # Give instances time to start
+def run_shared_source(num_instances, shared_stats, stop_evt, barrier):
+    """Run all instances as branches of a single shared-source pipeline"""
+    try:
+        print(f"🚀 Starting {num_instances} instances on a shared source...")
         
-        while True:
-            time.sleep(15)  # Update every 15 seconds
-            
-            print("\\n" + "="*80)
-            print("🎯 MULTI-INSTANCE YOLOv11l PERFORMANCE DASHBOARD")
-            print("="*80)
-            
-            total_fps = 0
-            total_frames = 0
-            total_detections = 0
-            
-            for instance_id in sorted(instance_callbacks.keys()):
-                callback = instance_callbacks[instance_id]
-                runtime = time.time() - callback.start_time
-                avg_fps = callback.get_count() / runtime if runtime > 0 else 0
-                
-                total_fps += avg_fps
-                total_frames += callback.get_count()
-                total_detections += callback.total_detections
-                
-                # Performance indicators
-                perf_indicator = "🟢" if avg_fps > 20 else "🟡" if avg_fps > 10 else "🔴"
-                
-                print(f"{perf_indicator} Instance {instance_id}: "
-                      f"Frames: {callback.get_count():7,d} | "
-                      f"Current FPS: {callback.current_fps:6.1f} | "
-                      f"Average FPS: {avg_fps:6.1f} | "
-                      f"Detections: {callback.total_detections:6,d}")
-            
-            print("-" * 80)
-            efficiency = (total_fps / (len(instance_callbacks) * 30)) * 100 if len(instance_callbacks) > 0 else 0
-            
-            print(f"📈 SUMMARY: {len(instance_callbacks)} instances | "
-                  f"Combined FPS: {total_fps:.1f} | "
-                  f"Total Frames: {total_frames:,d} | "
-                  f"Total Detections: {total_detections:,d}")
-            print(f"⚡ Efficiency: {efficiency:.1f}% of theoretical max (30 FPS per instance)")
-            print("="*80 + "\\n")
+        # Set environment for this process
+        project_root = Path(__file__).resolve().parent.parent
+        os.environ["HAILO_ENV_FILE"] = str(project_root / ".env")
+        
+        Gst.init(None)
+        warm_up_fps_kernel()
+        
+        app = SharedSourceDetectionApp(num_instances, stats_views(shared_stats))
+        
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            print("⚠️  Shared-source pipeline: startup barrier broken, starting anyway")
+        app.run()
+        
+    except Exception as e:
+        print(f"❌ Error in shared-source pipeline: {e}")
+        traceback.print_exc()
+        barrier.abort()
+    finally:
+        stop_evt.set()
+
+def last_error_message(stats, instance_id):
+    """Decode an instance's last probe error from the shared message buffer"""
+    return bytes(stats["err_msg"][instance_id]).rstrip(b"\0").decode(errors="replace")
+
+def print_dashboard(stats, last_errors):
+    """Print one performance dashboard for all instances"""
+    print("\\n" + "="*80)
+    print("🎯 MULTI-INSTANCE YOLOv11l PERFORMANCE DASHBOARD")
+    print("="*80)
+    
+    # Vector reductions over the stats arrays, only started slots count
+    active = np.flatnonzero(stats["start"])
+    counts = stats["counts"][active]
+    total_det = stats["total_det"][active]
+    runtime = time.monotonic() - stats["start"][active]
+    avg_fps = np.divide(counts, runtime, out=np.zeros(len(active)), where=runtime > 0)
+    
+    total_fps = float(avg_fps.sum())
+    total_frames = int(counts.sum())
+    total_detections = int(total_det.sum())
+    
+    # Loop only for pretty-printing
+    for i, instance_id in enumerate(active):
+        frame_count = int(counts[i])
+        det_per_frame = total_det[i] / frame_count if frame_count > 0 else 0
+        
+        # Performance indicators
+        perf_indicator = "🟢" if avg_fps[i] > 20 else "🟡" if avg_fps[i] > 10 else "🔴"
+        
+        print(f"{perf_indicator} Instance {instance_id}: "
+              f"Frames: {frame_count:7,d} | "
+              f"Current FPS: {stats['fps'][instance_id]:6.1f} | "
+              f"Average FPS: {avg_fps[i]:6.1f} | "
+              f"Detections: {int(total_det[i]):6,d} "
+              f"(last: {int(stats['det'][instance_id]):2d}, avg/frame: {det_per_frame:4.1f})")
+        
+        # Report errors raised in the probe since the last update
+        error_count = int(stats["err"][instance_id])
+        new_errors = error_count - last_errors.get(instance_id, 0)
+        if new_errors:
+            print(f"   ⚠️  Instance {instance_id}: {new_errors} detection errors, "
+                  f"last: {last_error_message(stats, instance_id)}")
+        last_errors[instance_id] = error_count
+        
+        # Top-3 classes by count, formatted here rather than in the probe
+        class_counts = stats["class_counts"][instance_id]
+        top = np.argpartition(class_counts, -3)[-3:]
+        top = top[np.argsort(class_counts[top])[::-1]]
+        top_str = " | ".join(f"class {cid}: {int(class_counts[cid]):,d}" for cid in top if class_counts[cid] > 0)
+        if top_str:
+            print(f"   🏷️  Top classes: {top_str}")
+    
+    print("-" * 80)
+    efficiency = (total_fps / (len(active) * 30)) * 100 if len(active) > 0 else 0
     
-    monitor_thread = threading.Thread(target=monitoring_thread, daemon=True)
-    monitor_thread.start()
+    print(f"📈 SUMMARY: {len(active)} instances | "
+          f"Combined FPS: {total_fps:.1f} | "
+          f"Total Frames: {total_frames:,d} | "
+          f"Total Detections: {total_detections:,d}")
+    print(f"⚡ Efficiency: {efficiency:.1f}% of theoretical max (30 FPS per instance)")
+    print("="*80 + "\\n")
 
 def main():
     """Main function to coordinate multiple YOLOv11l detection instances"""
@@ -226,9 +513,11 @@ def main():
     
     # Configuration
     num_instances = 4
+    # SHARED_SOURCE=1 captures/decodes once and tees frames to every instance
+    shared_source = bool(os.environ.get("SHARED_SOURCE"))
     
     # Pre-flight checks
-    yolo11_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.onnx"
+    yolo11_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.hef"
     if os.path.exists(yolo11_path):
         print(f"✅ Found YOLOv11l model: {yolo11_path}")
     else:
@@ -236,36 +525,74 @@ def main():
         print("Will attempt to use default model instead.")
     
     print(f"🚀 Launching {num_instances} parallel inference instances...")
-    print("📊 Each instance uses a separate vdevice-group-id for maximum parallelism")
-    print("🎥 Instance 0 shows video output, others run headless for performance")
-    print("📈 Performance monitoring will start in 5 seconds...")
+    if os.environ.get("HAILO_VGROUP") == "per-instance" or not (shared_source or os.environ.get("HAILO_MPS")):
+        print("📊 Each instance uses a separate vdevice-group-id")
+    elif shared_source:
+        print("📊 All instances share one vdevice group, interleaved by the HailoRT scheduler")
+    else:
+        print("📊 All instances share one vdevice group through the hailort multi-process service")
+    if os.environ.get("SHOW_VIDEO") and not shared_source:
+        print("🎥 Instance 0 shows video output, others run headless for performance")
+    else:
+        print("🎥 All instances run headless (set SHOW_VIDEO=1 to display instance 0)")
+    print("📈 Performance dashboard every 15 seconds once all instances are ready")
     print("⏹️  Press Ctrl+C to stop all instances\\n")
     
-    # Start performance monitoring
-    monitor_performance()
+    # Each instance runs in its own process so the probes don't contend on one GIL.
+    # Counters and the latest error messages are shared back to the parent
+    # through shared-memory arrays.
+    ctx = multiprocessing.get_context("spawn")
+    shared_stats = create_shared_stats(ctx)
+    # Set by any instance process when it exits
+    stop_evt = ctx.Event()
+    # Instance processes and main meet here once every app has been created
+    num_processes = 1 if shared_source else num_instances
+    barrier = ctx.Barrier(num_processes + 1, timeout=30)
+    
+    # Launch instances in separate processes
+    processes = []
     
-    # Launch instances in separate threads
-    threads = []
+    if shared_source:
+        process = ctx.Process(target=run_shared_source, args=(num_instances, shared_stats, stop_evt, barrier), daemon=False)
+        processes.append(process)
+        process.start()
+    else:
+        for i in range(num_instances):
+            process = ctx.Process(target=run_instance, args=(i, shared_stats, stop_evt, barrier), daemon=False)
+            processes.append(process)
+            process.start()
     
-    for i in range(num_instances):
-        thread = threading.Thread(target=run_instance, args=(i,), daemon=True)
-        threads.append(thread)
-        thread.start()
-        time.sleep(0.5)  # Small delay between starts
+    # Main stays on core 0; pinned only after the children have started so they
+    # inherit the full CPU mask (the shared-source process never re-pins itself)
+    os.sched_setaffinity(0, {0})
         
     try:
-        # Keep main thread alive
-        while True:
-            time.sleep(1)
-            # Check if any thread died
-            alive_threads = [t for t in threads if t.is_alive()]
-            if len(alive_threads) < num_instances:
-                print(f"⚠️  Warning: Only {len(alive_threads)}/{num_instances} instances running")
+        try:
+            barrier.wait()
+            print("✅ All instances ready")
+        except threading.BrokenBarrierError:
+            print("⚠️  Not all instances became ready (failed or timed out after 30 s)")
+        
+        # Main has no other work, so it prints the dashboard itself every 15 s
+        # until an instance exits (no separate monitoring thread)
+        print("📊 Performance monitoring started...")
+        stats = stats_views(shared_stats)
+        last_errors = {}
+        while not stop_evt.wait(15):
+            print_dashboard(stats, last_errors)
+            
+        alive_processes = [p for p in processes if p.is_alive()]
+        print(f"⚠️  An instance stopped, {len(alive_processes)}/{len(processes)} instance processes still running")
+        print("🛑 Shutting down all instances...")
                 
     except KeyboardInterrupt:
         print("\\n🛑 Shutting down all instances...")
-        print("Waiting for graceful cleanup...")
-        time.sleep(2)
+        
+    print("Waiting for graceful cleanup...")
+    for process in processes:
+        process.join(timeout=2)
+        if process.is_alive():
+            process.terminate()
 
 if __name__ == "__main__":
     main()
@@ -7,8 +7,9 @@ Runs 4 parallel inference instances on the Hailo processor with individual FPS t
 import os
 import time
 import threading
+import traceback
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
 import gi
 gi.require_version('Gst', '1.0')
 from gi.repository import Gst, GLib
@@ -31,6 +32,10 @@ from hailo_apps.hailo_app_python.core.gstreamer.gstreamer_helper_pipelines impor
     QUEUE
 )
 
+# hailo lookups used by the probe, resolved once at import
+_get_roi = hailo.get_roi_from_buffer
+_DET = hailo.HAILO_DETECTION
+
 class MultiInstanceCallback(app_callback_class):
     """Callback class for tracking multiple inference instances with FPS"""
     
@@ -38,23 +43,23 @@ class MultiInstanceCallback(app_callback_class):
         super().__init__()
         self.instance_id = instance_id
         self.last_time = time.time()
-        self.frame_times = []
+        # Ring buffer of the last 30 frame timestamps (ns)
+        self.frame_times = deque(maxlen=30)
         self.fps = 0.0
         self.detection_count = 0
+        # Probe errors are only counted, reporting is done by the stats thread
+        self.err_counter = 0
+        self.last_err = ""
         
     def calculate_fps(self):
         """Calculate FPS based on recent frame times"""
-        current_time = time.time()
-        self.frame_times.append(current_time)
-        
-        # Keep only the last 30 frames for FPS calculation
-        if len(self.frame_times) > 30:
-            self.frame_times.pop(0)
+        frame_times = self.frame_times
+        frame_times.append(time.monotonic_ns())
             
-        if len(self.frame_times) >= 2:
-            time_diff = self.frame_times[-1] - self.frame_times[0]
+        if len(frame_times) >= 2:
+            time_diff = frame_times[-1] - frame_times[0]
             if time_diff > 0:
-                self.fps = (len(self.frame_times) - 1) / time_diff
+                self.fps = (len(frame_times) - 1) * 1e9 / time_diff
         
         return self.fps
 
@@ -82,7 +87,7 @@ class MultiInstanceHailoApp:
         print(f"Auto-detected Hailo architecture: {self.arch}")
         
         # Use YOLOv11l model
-        self.hef_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.onnx"
+        self.hef_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.hef"
         if not os.path.exists(self.hef_path):
             # Fallback to default model location
             try:
@@ -91,7 +96,7 @@ class MultiInstanceHailoApp:
                     resource_type=RESOURCES_MODELS_DIR_NAME,
                 )
             except:
-                self.hef_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.onnx"
+                self.hef_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.hef"
         
         print(f"Using model: {self.hef_path}")
         
@@ -117,37 +122,40 @@ class MultiInstanceHailoApp:
         # Detection thresholds
         nms_score_threshold = 0.3
         nms_iou_threshold = 0.45
+        # The hailortpp postprocess reads the float32 NMS-by-class layout, the only
+        # NMS format it decodes; HAILO_OUT overrides it for non-NMS HEFs
+        output_format = os.environ.get("HAILO_OUT", "float32").upper()
         self.thresholds_str = (
             f"nms-score-threshold={nms_score_threshold} "
             f"nms-iou-threshold={nms_iou_threshold} "
-            f"output-format-type=HAILO_FORMAT_TYPE_FLOAT32"
+            f"output-format-type=HAILO_FORMAT_TYPE_{output_format}"
         )
         
+        # Run as fast as the hardware allows; REALTIME=1 paces source and display
+        # to the clock for interactive viewing
+        self.sync = bool(os.environ.get("REALTIME"))
+        
         # Video source - use webcam or test video
         self.video_source = "/dev/video0"  # Change this to your preferred source
         
     def create_inference_callback(self, instance_id):
         """Create callback function for a specific instance"""
         def app_callback(pad, info, user_data):
+            # Hot path: only update counters here, printing is done by the stats thread
             user_data.increment()
-            fps = user_data.calculate_fps()
+            user_data.calculate_fps()
             
             buffer = info.get_buffer()
             if buffer is None:
                 return Gst.PadProbeReturn.OK
                 
-            detection_info = []
+            # Count only - no per-detection label/confidence string formatting
             try:
-                for detection in hailo.get_roi_from_buffer(buffer).get_objects_typed(hailo.HAILO_DETECTION):
-                    detection_info.append(f"{detection.get_label()}: {detection.get_confidence():.2f}")
+                for detection in _get_roi(buffer).get_objects_typed(_DET):
                     user_data.detection_count += 1
             except Exception as e:
-                print(f"Instance {instance_id}: Error processing detections: {e}")
-                
-            # Print status every 30 frames
-            if user_data.get_count() % 30 == 0:
-                print(f"Instance {instance_id}: Frame {user_data.get_count()}, "
-                      f"FPS: {fps:.1f}, Detections: {len(detection_info)}")
+                user_data.err_counter += 1
+                user_data.last_err = repr(e)
                       
             return Gst.PadProbeReturn.OK
             
@@ -163,7 +171,7 @@ class MultiInstanceHailoApp:
                 video_width=self.video_width, 
                 video_height=self.video_height,
                 frame_rate=self.frame_rate, 
-                sync=True,
+                sync=self.sync,
                 no_webcam_compression=True,
                 name=f'source_{instance_id}'
             )
@@ -190,16 +198,16 @@ class MultiInstanceHailoApp:
         if instance_id == 0:
             display_pipeline = DISPLAY_PIPELINE(
                 video_sink='autovideosink', 
-                sync=True, 
+                sync=self.sync, 
                 show_fps=True
             )
         else:
-            display_pipeline = f"{QUEUE(name=f'sink_queue_{instance_id}')} ! fakesink sync=false"
+            display_pipeline = f"{QUEUE(name=f'sink_queue_{instance_id}')} ! fakesink sync=false qos=false"
             
         # Complete pipeline
         pipeline_string = (
             f'{source_pipeline} ! '
-            f'{QUEUE(name=f"queue_to_inference_{instance_id}")} ! '
+            f'{QUEUE(name=f"queue_to_inference_{instance_id}", leaky="downstream", max_size_buffers=3)} ! '
             f'{inference_pipeline} ! '
             f'{user_callback_pipeline} ! '
             f'{display_pipeline}'
@@ -215,7 +223,7 @@ class MultiInstanceHailoApp:
             video_width=self.video_width, 
             video_height=self.video_height,
             frame_rate=self.frame_rate, 
-            sync=True,
+            sync=self.sync,
             no_webcam_compression=True,
             name='main_source'
         )
@@ -242,16 +250,16 @@ class MultiInstanceHailoApp:
             if i == 0:
                 display_pipeline = DISPLAY_PIPELINE(
                     video_sink='autovideosink', 
-                    sync=True, 
+                    sync=self.sync, 
                     show_fps=True
                 )
             else:
-                display_pipeline = f"{QUEUE(name=f'sink_queue_{i}')} ! fakesink sync=false"
+                display_pipeline = f"{QUEUE(name=f'sink_queue_{i}')} ! fakesink sync=false qos=false"
             
             # Add this branch to the pipeline
             branch = (
                 f"input_tee. ! "
-                f"{QUEUE(name=f'queue_to_inference_{i}')} ! "
+                f"{QUEUE(name=f'queue_to_inference_{i}', leaky='downstream', max_size_buffers=3)} ! "
                 f"{inference_pipeline} ! "
                 f"{user_callback_pipeline} ! "
                 f"{display_pipeline}"
@@ -294,6 +302,9 @@ class MultiInstanceHailoApp:
                     print(f"Instance {i}: {fps:.1f} FPS, "
                           f"Frames: {callback_data.get_count()}, "
                           f"Detections: {callback_data.detection_count}")
+                    if callback_data.err_counter:
+                        print(f"Instance {i}: errors: {callback_data.err_counter} last: {callback_data.last_err}")
+                        callback_data.err_counter = 0
                 print(f"Total FPS: {total_fps:.1f}")
                 print("========================\\n")
                 
@@ -366,7 +377,7 @@ def main():
     """Main function"""
     try:
         # Check for YOLOv11l model
-        yolo11_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.onnx"
+        yolo11_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.hef"
         if not os.path.exists(yolo11_path):
             print(f"Warning: YOLOv11l model not found at {yolo11_path}")
             print("The script will attempt to use the default model instead.")
@@ -379,7 +390,6 @@ def main():
         print("\\nApplication stopped by user")
     except Exception as e:
         print(f"Application error: {e}")
-        import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
@@ -6,13 +6,18 @@ Based on the hailo-apps-infra detection_simple example.
 """
 
 import os
+import gc
+import sys
 import time
-import threading
-import multiprocessing
+import signal
+import logging
 from pathlib import Path
+# threading is already loaded by logging; instances only need the barrier error
+from threading import BrokenBarrierError
+import numpy as np
 import gi
 gi.require_version('Gst', '1.0')
-from gi.repository import Gst
+from gi.repository import Gst, GLib
 import hailo
 
 from hailo_apps.hailo_app_python.core.gstreamer.gstreamer_app import app_callback_class, GStreamerApp
@@ -36,89 +41,213 @@ from hailo_apps.hailo_app_python.core.gstreamer.gstreamer_helper_pipelines impor
     QUEUE
 )
 
+from nms import postprocess, warm_up as warm_up_nms
+
+logger = logging.getLogger("multi_yolo")
+
+# Resource lookups and the architecture probe. main() resolves them once and
+# hands the result to every instance process (see resolve_shared_config)
+_RESOLVED = {}
+_NOT_PROBED = "not-probed"
+_DETECTED_ARCH = _NOT_PROBED
+
+def detected_arch():
+    """Memoized detect_hailo_arch, only probed when --arch is not given"""
+    global _DETECTED_ARCH
+    if _DETECTED_ARCH is _NOT_PROBED:
+        _DETECTED_ARCH = detect_hailo_arch()
+    return _DETECTED_ARCH
+
+def resolve_resource(pipeline_name, resource_type, model=None):
+    """Memoized get_resource_path"""
+    key = (pipeline_name, resource_type, model)
+    if key not in _RESOLVED:
+        if model is None:
+            _RESOLVED[key] = get_resource_path(pipeline_name=pipeline_name, resource_type=resource_type)
+        else:
+            _RESOLVED[key] = get_resource_path(
+                pipeline_name=pipeline_name, resource_type=resource_type, model=model)
+    return _RESOLVED[key]
+
+def resolve_shared_config():
+    """Probe the arch (unless --arch is given) and resolve resource paths, once for all instances"""
+    options, _ = get_default_parser().parse_known_args()
+    if options.arch is None:
+        detected_arch()
+    resolve_resource(SIMPLE_DETECTION_PIPELINE, RESOURCES_MODELS_DIR_NAME)
+    resolve_resource(SIMPLE_DETECTION_PIPELINE, RESOURCES_VIDEOS_DIR_NAME, SIMPLE_DETECTION_VIDEO_NAME)
+    resolve_resource(SIMPLE_DETECTION_PIPELINE, RESOURCES_SO_DIR_NAME, SIMPLE_DETECTION_POSTPROCESS_SO_FILENAME)
+    return _DETECTED_ARCH, dict(_RESOLVED)
+
+def prime_shared_config(config):
+    """Seed this process's caches with the result of resolve_shared_config"""
+    global _DETECTED_ARCH
+    arch, resolved = config
+    # A string, so it survives pickling to the instance process unchanged
+    if arch != _NOT_PROBED:
+        _DETECTED_ARCH = arch
+    _RESOLVED.update(resolved)
+
+# Probe return value, resolved once instead of through the pygobject enum per frame
+_PROBE_OK = Gst.PadProbeReturn.OK
+
+# Sink for branches nobody watches
+FAKESINK_PROPS = "fakesink sync=false async=false enable-last-sample=false signal-handoffs=false"
+
+def single_process_mode():
+    """True when every instance runs in this process (SINGLE_PROCESS=1 or FUSED=1)"""
+    return bool(os.environ.get("SINGLE_PROCESS") or os.environ.get("FUSED"))
+
+def setup_logging():
+    """Configure logging from HAILO_LOG_LEVEL (default INFO), once per process"""
+    level = os.environ.get("HAILO_LOG_LEVEL", "INFO").upper()
+    # getLevelName maps known names to their int level, anything else to a string
+    if not isinstance(logging.getLevelName(level), int):
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        logger.warning("Unknown HAILO_LOG_LEVEL %r, using INFO", level)
+        return
+    logging.basicConfig(level=level, format="%(message)s")
+
 class MultiInstanceCallback(app_callback_class):
     """Enhanced callback class with FPS tracking per instance"""
     
-    def __init__(self, instance_id):
+    def __init__(self, instance_id, stats_q=None):
         super().__init__()
         self.instance_id = instance_id
-        self.start_time = time.time()
-        self.last_fps_time = time.time()
+        self.stats_q = stats_q
+        self._last_ns = time.perf_counter_ns()
+        self._start_ns = self._last_ns
         self.fps_frame_count = 0
         self.current_fps = 0.0
         self.detection_count = 0
         self.total_detections = 0
         
-    def calculate_fps(self):
-        """Calculate current FPS"""
-        current_time = time.time()
+    def calculate_fps(self, now_ns):
+        """Calculate current FPS, now_ns is the caller's time.perf_counter_ns()"""
         self.fps_frame_count += 1
         
         # Calculate FPS every 30 frames
-        if self.fps_frame_count >= 30:
-            time_diff = current_time - self.last_fps_time
+        if self.fps_frame_count == 30:
+            time_diff = now_ns - self._last_ns
             if time_diff > 0:
-                self.current_fps = self.fps_frame_count / time_diff
+                self.current_fps = 30 * 1_000_000_000 / time_diff
             
             self.fps_frame_count = 0
-            self.last_fps_time = current_time
+            self._last_ns = now_ns
             
         return self.current_fps
 
-def create_app_callback(instance_id):
+def create_app_callback(instance_id, score_threshold, fastcount=False, raw_tensors=None):
     """Create callback function for specific instance"""
+    # Resolve module/enum attributes once, the probe reads them as closure locals
+    _get_roi = hailo.get_roi_from_buffer
+    _DET = hailo.HAILO_DETECTION
+    _USER_META = hailo.HAILO_USER_META
+    _OK = _PROBE_OK
+    
+    # raw_tensors="<boxes>,<scores>" names the decoded output tensors filtered in
+    # the Numba kernel instead of walking HailoDetection objects (see nms.py)
+    if raw_tensors:
+        boxes_name, scores_name = raw_tensors.split(",")
     
     def app_callback(pad, info, user_data):
         user_data.increment()
-        fps = user_data.calculate_fps()
+        # One clock read per frame, shared by the FPS and status calculations
+        now = time.perf_counter_ns()
+        fps = user_data.calculate_fps(now)
         
         # Parse detections from buffer
         buffer = info.get_buffer()
         if buffer is None:
-            return Gst.PadProbeReturn.OK
+            return _OK
             
-        detection_info = []
+        # Count only, label/confidence strings are built for the status log below
+        n = 0
+        detections = ()
         try:
-            roi = hailo.get_roi_from_buffer(buffer)
-            detections = roi.get_objects_typed(hailo.HAILO_DETECTION)
-            for detection in detections:
-                label = detection.get_label()
-                confidence = detection.get_confidence()
-                detection_info.append(f"{label}: {confidence:.2f}")
-                user_data.total_detections += 1
+            roi = _get_roi(buffer)
+            if fastcount:
+                # yolo_fastcount leaves a single user meta holding the box count
+                metas = roi.get_objects_typed(_USER_META)
+                if metas:
+                    n = metas[0].get_user_int()
+                    user_data.total_detections += n
+            elif raw_tensors:
+                boxes = np.asarray(roi.get_tensor(boxes_name), dtype=np.float32).reshape(-1, 4)
+                scores = np.asarray(roi.get_tensor(scores_name), dtype=np.float32)
+                n, _ = postprocess(boxes, scores.reshape(boxes.shape[0], -1), score_threshold)
+                user_data.total_detections += n
+            else:
+                detections = roi.get_objects_typed(_DET)
+                for detection in detections:
+                    user_data.total_detections += 1
+                    n += 1
         except Exception as e:
-            print(f"Instance {instance_id}: Detection parsing error: {e}")
+            logger.warning("Instance %d: Detection parsing error: %s", instance_id, e)
             
-        user_data.detection_count = len(detection_info)
+        user_data.detection_count = n
         
-        # Print status every 60 frames to avoid spam
         if user_data.get_count() % 60 == 0:
-            runtime = time.time() - user_data.start_time
-            avg_fps = user_data.get_count() / runtime if runtime > 0 else 0
-            print(f"Instance {instance_id}: Frame {user_data.get_count()}, "
-                  f"Current FPS: {fps:.1f}, Avg FPS: {avg_fps:.1f}, "
-                  f"Detections: {user_data.detection_count}, "
-                  f"Total: {user_data.total_detections}")
+            report_status(user_data, now, fps, detections)
                   
-        return Gst.PadProbeReturn.OK
+        return _OK
+        
+    def report_status(user_data, now, fps, detections):
+        """Push a stats tuple to the monitor and log status, once every 60 frames"""
+        if user_data.stats_q is not None:
+            user_data.stats_q.put_nowait(
+                (instance_id, user_data.get_count(), fps, user_data.total_detections))
+        
+        # Skip all formatting when INFO is disabled
+        if logger.isEnabledFor(logging.INFO):
+            runtime_ns = now - user_data._start_ns
+            avg_fps = user_data.get_count() * 1_000_000_000 / runtime_ns if runtime_ns > 0 else 0
+            logger.info("Instance %d: Frame %d, Current FPS: %.1f, Avg FPS: %.1f, "
+                        "Detections: %d, Total: %d",
+                        instance_id, user_data.get_count(), fps, avg_fps,
+                        user_data.detection_count, user_data.total_detections)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Instance %d: %s", instance_id, ", ".join(
+                    f"{detection.get_label()}: {detection.get_confidence():.2f}"
+                    for detection in detections))
         
     return app_callback
 
 class MultiInstanceDetectionApp(GStreamerApp):
     """Multi-instance detection application"""
     
-    def __init__(self, instance_id=0, total_instances=4):
+    def __init__(self, instance_id=0, total_instances=4, fused=False, stats_q=None):
         # Setup parser
         parser = get_default_parser()
         parser.add_argument("--labels-json", default=None, help="Path to labels JSON file")
         parser.add_argument("--instances", type=int, default=4, help="Number of inference instances")
         parser.add_argument("--model-path", default=None, help="Path to HEF/ONNX model file")
+        parser.add_argument("--isolated", action="store_true",
+                            help="Give each instance its own vdevice group instead of sharing one")
         
         # Create callback for this instance
         self.instance_id = instance_id
         self.total_instances = total_instances
-        user_data = MultiInstanceCallback(instance_id)
-        app_callback = create_app_callback(instance_id)
+        self.fused = fused
+        self.stats_q = stats_q
+        
+        # Detection thresholds for YOLOv11l, the score threshold is shared with the probe
+        self.nms_score_threshold = 0.3
+        self.nms_iou_threshold = 0.45
+        
+        user_data = MultiInstanceCallback(instance_id, stats_q)
+        # HAILO_RAW_TENSORS=<boxes>,<scores> runs a HEF compiled with on-chip box
+        # decoding but no NMS: hailonet gets no nms-* params, the hailortpp
+        # hailofilter is removed and the probe filters the tensors in nms.py
+        self.raw_tensors = os.environ.get("HAILO_RAW_TENSORS")
+        # HAILO_FASTCOUNT_SO=<path to libyolo_fastcount_postprocess.so> has the
+        # non-display instances count boxes in C instead of building detections
+        self.fastcount_so = None
+        if instance_id > 0 and not fused and not self.raw_tensors:
+            self.fastcount_so = os.environ.get("HAILO_FASTCOUNT_SO")
+        app_callback = create_app_callback(instance_id, self.nms_score_threshold,
+                                           fastcount=self.fastcount_so is not None,
+                                           raw_tensors=self.raw_tensors)
         
         # Call parent constructor
         super().__init__(parser, user_data)
@@ -128,34 +257,30 @@ class MultiInstanceDetectionApp(GStreamerApp):
         self.video_height = 640
         self.batch_size = 1
         
-        # Detection thresholds for YOLOv11l
-        nms_score_threshold = 0.3
-        nms_iou_threshold = 0.45
-        
         # Check for YOLOv11l model
-        yolo11_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.onnx"
+        yolo11_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.hef"
         if self.options_menu.model_path:
             self.hef_path = self.options_menu.model_path
         elif os.path.exists(yolo11_path):
             self.hef_path = yolo11_path
             print(f"Using YOLOv11l model: {self.hef_path}")
         else:
-            # Fallback to default model
-            try:
-                self.hef_path = get_resource_path(
-                    pipeline_name=SIMPLE_DETECTION_PIPELINE,
-                    resource_type=RESOURCES_MODELS_DIR_NAME,
-                )
-                print(f"Using default model: {self.hef_path}")
-            except:
+            # Fallback to default model; get_resource_path returns None or an
+            # unchecked path rather than raising when the resource is missing
+            self.hef_path = resolve_resource(
+                pipeline_name=SIMPLE_DETECTION_PIPELINE,
+                resource_type=RESOURCES_MODELS_DIR_NAME,
+            )
+            if self.hef_path is None or not Path(self.hef_path).is_file():
                 raise ValueError("Could not find YOLOv11l model or default model")
+            print(f"Using default model: {self.hef_path}")
         
         # Auto-detect architecture
         if self.options_menu.arch is None:
-            detected_arch = detect_hailo_arch()
-            if detected_arch is None:
+            arch = detected_arch()
+            if arch is None:
                 raise ValueError("Could not auto-detect Hailo architecture")
-            self.arch = detected_arch
+            self.arch = arch
             print(f"Auto-detected Hailo architecture: {self.arch}")
         else:
             self.arch = self.options_menu.arch
@@ -168,7 +293,7 @@ class MultiInstanceDetectionApp(GStreamerApp):
                 self.video_source = "/dev/video0"
                 print(f"Instance {instance_id}: Using webcam: /dev/video0")
             else:
-                self.video_source = get_resource_path(
+                self.video_source = resolve_resource(
                     pipeline_name=SIMPLE_DETECTION_PIPELINE,
                     resource_type=RESOURCES_VIDEOS_DIR_NAME,
                     model=SIMPLE_DETECTION_VIDEO_NAME
@@ -179,31 +304,78 @@ class MultiInstanceDetectionApp(GStreamerApp):
             print(f"Instance {instance_id}: Using input: {self.video_source}")
         
         # Post-processing configuration
-        try:
-            self.post_process_so = get_resource_path(
-                pipeline_name=SIMPLE_DETECTION_PIPELINE,
-                resource_type=RESOURCES_SO_DIR_NAME,
-                model=SIMPLE_DETECTION_POSTPROCESS_SO_FILENAME
-            )
-        except:
+        self.post_process_so = resolve_resource(
+            pipeline_name=SIMPLE_DETECTION_PIPELINE,
+            resource_type=RESOURCES_SO_DIR_NAME,
+            model=SIMPLE_DETECTION_POSTPROCESS_SO_FILENAME
+        )
+        if self.post_process_so is None or not Path(self.post_process_so).is_file():
             self.post_process_so = None
             print("Warning: Could not find post-processing shared object")
             
         self.post_function_name = SIMPLE_DETECTION_POSTPROCESS_FUNCTION
+        if self.fastcount_so:
+            self.post_process_so = self.fastcount_so
+            self.post_function_name = "yolo_fastcount"
         self.labels_json = self.options_menu.labels_json
         self.app_callback = app_callback
         
-        self.thresholds_str = (
-            f"nms-score-threshold={nms_score_threshold} "
-            f"nms-iou-threshold={nms_iou_threshold} "
-            f"output-format-type=HAILO_FORMAT_TYPE_FLOAT32"
-        )
+        # On-device NMS output comes as float32 (or uint16), and both the hailortpp
+        # postprocess and yolo_fastcount walk the float32 NMS-by-class layout;
+        # HAILO_OUT=uint8 is only for HEFs without on-device NMS
+        output_format = os.environ.get("HAILO_OUT", "float32").upper()
+        if self.fastcount_so or self.raw_tensors:
+            output_format = "FLOAT32"
+        
+        if self.raw_tensors:
+            # No NMS on the device, the probe applies the score threshold itself
+            self.thresholds_str = f"output-format-type=HAILO_FORMAT_TYPE_{output_format}"
+        else:
+            self.thresholds_str = (
+                f"nms-score-threshold={self.nms_score_threshold} "
+                f"nms-iou-threshold={self.nms_iou_threshold} "
+                f"output-format-type=HAILO_FORMAT_TYPE_{output_format}"
+            )
+        
+        # A vdevice group only spans hailonets in one process. In the single-process
+        # modes, or across processes with HAILO_MPS=1 (needs the hailort service
+        # running), instances share group 1 so HailoRT loads the HEF once and
+        # round-robins frames across streams; otherwise, or with --isolated, each
+        # instance gets its own group
+        multi_process_service = bool(os.environ.get("HAILO_MPS"))
+        if self.options_menu.isolated or not (single_process_mode() or multi_process_service):
+            self.vdevice_group_id = self.instance_id + 1
+        else:
+            self.vdevice_group_id = 1
+            self.thresholds_str += " scheduling-algorithm=1"
+            if multi_process_service:
+                self.thresholds_str += " multi-process-service=true"
         
         # Create pipeline
         self.create_pipeline()
         
+    def create_pipeline(self):
+        """Create the pipeline, dropping the NMS postprocess in raw-tensor mode"""
+        super().create_pipeline()
+        if self.raw_tensors:
+            self.remove_postprocess_filters()
+        
+    def remove_postprocess_filters(self):
+        """Unlink every hailofilter so hailonet's raw output tensors reach the probe"""
+        filters = [element for element in self.pipeline.iterate_recurse()
+                   if element.get_factory().get_name() == "hailofilter"]
+        for hailofilter in filters:
+            upstream = hailofilter.get_static_pad("sink").get_peer().get_parent_element()
+            downstream = hailofilter.get_static_pad("src").get_peer().get_parent_element()
+            upstream.unlink(hailofilter)
+            hailofilter.unlink(downstream)
+            self.pipeline.remove(hailofilter)
+            upstream.link(downstream)
+        
     def get_pipeline_string(self):
         """Generate GStreamer pipeline string for this instance"""
+        if self.fused:
+            return build_fused_pipeline_string(self)
         
         # Source pipeline - each instance can share the same source or have individual sources
         source_pipeline = SOURCE_PIPELINE(
@@ -216,7 +388,7 @@ class MultiInstanceDetectionApp(GStreamerApp):
             name=f'source_{self.instance_id}'
         )
         
-        # Inference pipeline with unique vdevice group ID for each instance
+        # Inference pipeline on the shared (or, with --isolated, per-instance) vdevice group
         inference_pipeline = INFERENCE_PIPELINE(
             hef_path=self.hef_path,
             post_process_so=self.post_process_so,
@@ -225,7 +397,7 @@ class MultiInstanceDetectionApp(GStreamerApp):
             config_json=self.labels_json,
             additional_params=self.thresholds_str,
             name=f'inference_{self.instance_id}',
-            vdevice_group_id=self.instance_id + 1  # Unique vdevice group for parallel processing
+            vdevice_group_id=self.vdevice_group_id
         )
         
         # User callback pipeline
@@ -239,8 +411,12 @@ class MultiInstanceDetectionApp(GStreamerApp):
                 show_fps=self.show_fps
             )
         else:
-            # For other instances, just consume the data without display
-            display_pipeline = f"{QUEUE(name=f'sink_queue_{self.instance_id}')} ! fakesink sync=false"
+            # For other instances, just consume the data without display; drop
+            # instead of queueing and skip per-buffer signals and last-sample refs
+            display_pipeline = (
+                f"{QUEUE(name=f'sink_queue_{self.instance_id}', leaky='downstream', max_size_buffers=2)} ! "
+                f"{FAKESINK_PROPS}"
+            )
         
         # Complete pipeline string
         pipeline_string = (
@@ -253,35 +429,201 @@ class MultiInstanceDetectionApp(GStreamerApp):
         print(f"Instance {self.instance_id} pipeline: {pipeline_string}")
         return pipeline_string
 
-def monitor_fps():
-    """Monitor and print basic status - detailed stats are printed by each instance"""
+def build_fused_pipeline_string(app):
+    """Generate one pipeline that tees a single source into every instance's inference branch"""
+    source_pipeline = SOURCE_PIPELINE(
+        video_source=app.video_source,
+        video_width=app.video_width, 
+        video_height=app.video_height,
+        frame_rate=app.frame_rate, 
+        sync=app.sync,
+        no_webcam_compression=True,
+        name='source_fused'
+    )
+    
+    branches = []
+    for i in range(app.total_instances):
+        inference_pipeline = INFERENCE_PIPELINE(
+            hef_path=app.hef_path,
+            post_process_so=app.post_process_so,
+            post_function_name=app.post_function_name,
+            batch_size=app.batch_size,
+            config_json=app.labels_json,
+            additional_params=app.thresholds_str,
+            name=f'inference_{i}',
+            vdevice_group_id=app.vdevice_group_id
+        )
+        branches.append(
+            f"t. ! {QUEUE(name=f'branch_queue_{i}', leaky='downstream', max_size_buffers=2)} ! "
+            f"{inference_pipeline} ! "
+            f"identity name=probe_{i} ! "
+            f"{FAKESINK_PROPS}"
+        )
+    
+    pipeline_string = f"{source_pipeline} ! tee name=t " + " ".join(branches)
+    print(f"Fused pipeline: {pipeline_string}")
+    return pipeline_string
+
+def monitor_fps(stats_q):
+    """Drain per-instance stats from stats_q and print an aggregated table once per round"""
+    import queue
+    import threading
+    
     def monitor_thread():
+        latest = {}
+        fresh = set()
         while True:
-            time.sleep(30)  # Print status every 30 seconds
-            print("\\n" + "="*60)
-            print("MULTI-INSTANCE DETECTION STATUS")
-            print("Individual instance statistics are shown above.")
-            print("Each instance reports its own FPS and detection counts.")
-            print("="*60 + "\\n")
+            # Block until an instance reports; nothing to print while all are quiet
+            try:
+                instance_id, frames, fps, total_detections = stats_q.get(timeout=30)
+            except queue.Empty:
+                continue
+            
+            # A repeat reporter means every live instance has had its turn
+            if instance_id in fresh:
+                print("="*60)
+                print("MULTI-INSTANCE DETECTION STATUS")
+                for i in sorted(latest):
+                    f, r, t = latest[i]
+                    print(f"Instance {i}: Frames {f}, FPS {r:.1f}, Total detections {t}")
+                print(f"Combined FPS: {sum(r for _, r, _ in latest.values()):.1f}")
+                print("="*60)
+                fresh.clear()
+            fresh.add(instance_id)
+            latest[instance_id] = (frames, fps, total_detections)
     
     monitor_thread_obj = threading.Thread(target=monitor_thread, daemon=True)
     monitor_thread_obj.start()
 
-def run_single_instance(instance_id, total_instances):
+def promote_streaming_threads(pipeline, priority):
+    """Move each GStreamer streaming thread of pipeline to SCHED_FIFO as it starts"""
+    def on_sync_message(bus, message):
+        if message.type == Gst.MessageType.STREAM_STATUS:
+            status_type, owner = message.parse_stream_status()
+            if status_type == Gst.StreamStatusType.ENTER:
+                # Sync handlers run in the posting thread, i.e. the new streaming thread
+                try:
+                    os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+                except PermissionError:
+                    pass
+        return Gst.BusSyncReply.PASS
+    
+    pipeline.get_bus().set_sync_handler(on_sync_message)
+
+def run_single_instance(instance_id, total_instances, stats_q=None, barrier=None, config=None):
     """Run a single instance of the detection app"""
     try:
+        # Reuse the arch and resource paths main() already resolved
+        if config is not None:
+            prime_shared_config(config)
+        setup_logging()
         print(f"Starting instance {instance_id}...")
         # Initialize GStreamer in each process
         Gst.init(None)
-        app = MultiInstanceDetectionApp(instance_id, total_instances)
+        warm_up_nms()
+        # Probe allocations are short-lived and acyclic, refcounting frees them;
+        # a longer switch interval cuts GIL handoffs between probe and main loop
+        gc.disable()
+        sys.setswitchinterval(0.02)
+        # Pin to one core before any streaming threads exist so they inherit it
+        os.sched_setaffinity(0, {instance_id % os.cpu_count()})
+        if os.environ.get("HAILO_NICE"):
+            try:
+                os.nice(int(os.environ["HAILO_NICE"]))
+            except PermissionError:
+                print(f"Instance {instance_id}: HAILO_NICE needs CAP_SYS_NICE, ignoring")
+        
+        app = MultiInstanceDetectionApp(instance_id, total_instances, stats_q=stats_q)
+        # HAILO_RT_PRIO=<1-99> runs the streaming threads under SCHED_FIFO
+        if os.environ.get("HAILO_RT_PRIO"):
+            promote_streaming_threads(app.pipeline, int(os.environ["HAILO_RT_PRIO"]))
+        
+        if barrier is not None:
+            # Load the HEF by prerolling to PAUSED, then start PLAYING together
+            if app.pipeline.set_state(Gst.State.PAUSED) == Gst.StateChangeReturn.FAILURE:
+                raise RuntimeError("Pipeline failed to reach PAUSED")
+            if app.pipeline.get_state(30 * Gst.SECOND)[0] == Gst.StateChangeReturn.FAILURE:
+                raise RuntimeError("Pipeline failed to preroll")
+            try:
+                barrier.wait(timeout=30)
+            except BrokenBarrierError:
+                # Another instance failed or is slow to preroll; only the
+                # synchronized start is lost, this instance still runs
+                print(f"Instance {instance_id}: starting without waiting for the other instances")
         app.run()
     except Exception as e:
+        # Release the other instances instead of leaving them at the barrier;
+        # they start on their own
+        if barrier is not None:
+            barrier.abort()
         print(f"Error in instance {instance_id}: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        gc.collect()
+
+def run_single_process(num_instances, stats_q=None):
+    """Run every instance as its own pipeline on one shared GLib main loop"""
+    Gst.init(None)
+    warm_up_nms()
+    # FUSED=1 captures/decodes once and tees every frame to all instances
+    if os.environ.get("FUSED"):
+        fused_app = MultiInstanceDetectionApp(0, num_instances, fused=True, stats_q=stats_q)
+        apps = [fused_app]
+        probes = [(fused_app, f"probe_{i}", create_app_callback(i, fused_app.nms_score_threshold,
+                                                                raw_tensors=fused_app.raw_tensors),
+                   MultiInstanceCallback(i, stats_q))
+                  for i in range(num_instances)]
+    else:
+        apps = [MultiInstanceDetectionApp(i, num_instances, stats_q=stats_q)
+                for i in range(num_instances)]
+        probes = [(app, "identity_callback", app.app_callback, app.user_data) for app in apps]
+    loop = GLib.MainLoop()
+    
+    def on_message(bus, message, app):
+        if message.type == Gst.MessageType.EOS:
+            # Loop file sources like GStreamerApp does
+            app.pipeline.seek_simple(
+                Gst.Format.TIME, Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT, 0)
+        elif message.type == Gst.MessageType.ERROR:
+            err, debug = message.parse_error()
+            logger.warning("Instance %d error: %s", app.instance_id, err)
+            loop.quit()
+        return True
+    
+    def on_signal():
+        print("\nShutting down all instances...")
+        loop.quit()
+        return GLib.SOURCE_REMOVE
+    
+    # GStreamerApp.run() owns its own loop, so wire up probes and buses here;
+    # BUFFER only, so buffer lists never reach the Python probe
+    for app, name, callback, user_data in probes:
+        identity = app.pipeline.get_by_name(name)
+        identity.get_static_pad("src").add_probe(Gst.PadProbeType.BUFFER, callback, user_data)
+    for app in apps:
+        bus = app.pipeline.get_bus()
+        bus.add_signal_watch()
+        bus.connect("message", on_message, app)
+    
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signum, on_signal)
+    
+    for app in apps:
+        app.pipeline.set_state(Gst.State.PLAYING)
+    try:
+        loop.run()
+    finally:
+        for app in apps:
+            app.pipeline.set_state(Gst.State.NULL)
 
 def main():
     """Main function to run multiple instances"""
+    # Only the parent uses multiprocessing directly; instances just receive its
+    # Queue/Barrier objects
+    import multiprocessing
+    
+    setup_logging()
     try:
         print("Multi-Instance Hailo YOLOv11l Detection")
         print("========================================")
@@ -290,7 +632,7 @@ def main():
         num_instances = 4
         
         # Check for YOLOv11l model
-        yolo11_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.onnx"
+        yolo11_path = "/home/sam/rpi-5-halio-pwm/models/yolo11l.hef"
         if os.path.exists(yolo11_path):
             print(f"Found YOLOv11l model: {yolo11_path}")
         else:
@@ -298,23 +640,38 @@ def main():
             print("Will use default model instead.")
         
         print(f"Starting {num_instances} parallel inference instances...")
-        print("Each instance will run on a separate vdevice group for maximum parallelism.")
+        if single_process_mode():
+            print("Instances share one vdevice group through the HailoRT scheduler (--isolated to split them).")
+        elif os.environ.get("HAILO_MPS"):
+            print("Instances share one vdevice group through the hailort multi-process service.")
+        else:
+            print("Each instance runs on its own vdevice group (HAILO_MPS=1 to share one via the hailort service).")
         print("Press Ctrl+C to stop all instances.\\n")
         
-        # Start FPS monitoring thread
-        monitor_fps()
+        # Resolve once here, the instances (or in-process apps) reuse it
+        config = resolve_shared_config()
+        
+        # Start FPS monitoring thread, fed by every instance's 60-frame status
+        stats_q = multiprocessing.Queue()
+        monitor_fps(stats_q)
+        
+        # SINGLE_PROCESS=1 (implied by FUSED=1) hosts every pipeline in this process on one main loop
+        if single_process_mode():
+            run_single_process(num_instances, stats_q)
+            return
         
         # Use multiprocessing instead of threading to avoid signal handler conflicts
         processes = []
+        # Instances start together once every pipeline has loaded its HEF
+        barrier = multiprocessing.Barrier(num_instances)
         
         for i in range(num_instances):
             process = multiprocessing.Process(
                 target=run_single_instance, 
-                args=(i, num_instances)
+                args=(i, num_instances, stats_q, barrier, config)
             )
             processes.append(process)
             process.start()
-            time.sleep(1)  # Small delay between instance starts
         
         # Wait for all processes
         try:
@@ -343,7 +700,21 @@ if __name__ == "__main__":
     if env_file.exists():
         os.environ["HAILO_ENV_FILE"] = str(env_file)
     
-    # Set multiprocessing start method for compatibility
-    multiprocessing.set_start_method('spawn', force=True)
+    # Quiet HailoRT monitor and log file so the scheduler isn't slowed by I/O
+    os.environ.setdefault("HAILO_MONITOR", "0")
+    os.environ.setdefault("HAILORT_LOGGER_PATH", "NONE")
+    
+    # forkserver pays the gi/Gst/hailo and script import cost once in the server
+    # and forks each instance from it. The parent never opens a Hailo device, so
+    # no device handle is inherited by the children.
+    import multiprocessing
+    multiprocessing.set_start_method('forkserver', force=True)
+    multiprocessing.set_forkserver_preload([
+        '__main__',
+        'gi',
+        'gi.repository.Gst',
+        'hailo',
+        'hailo_apps.hailo_app_python.core.gstreamer.gstreamer_app',
+    ])
     
     main()
@@ -0,0 +1,37 @@
+"""
+Numba-compiled detection filter for decoded, non-NMS YOLO output tensors.
+Falls back to plain Python when Numba is not installed.
+
+Expects a HEF compiled with on-chip box decoding but without the NMS end node,
+read with float32 output:
+  boxes  (N, 4) float32, one row per anchor: x_min, y_min, x_max, y_max
+  scores (N, C) float32, one row per anchor: per-class score after sigmoid
+The per-scale DFL/class outputs of a plain YOLOv11 HEF are not supported.
+"""
+
+import numpy as np
+
+from _fpskernel import njit
+
+@njit(cache=True, fastmath=True)
+def postprocess(boxes_f32, scores_f32, thr):
+    """Count boxes whose best class score exceeds thr, returns (count, kept indices)"""
+    n = boxes_f32.shape[0]
+    kept = np.empty(n, dtype=np.int32)
+    count = 0
+    for i in range(n):
+        # Degenerate boxes never survive, skip their score scan
+        if boxes_f32[i, 2] <= boxes_f32[i, 0] or boxes_f32[i, 3] <= boxes_f32[i, 1]:
+            continue
+        best = scores_f32[i, 0]
+        for c in range(1, scores_f32.shape[1]):
+            if scores_f32[i, c] > best:
+                best = scores_f32[i, c]
+        if best > thr:
+            kept[count] = i
+            count += 1
+    return count, kept[:count]
+
+def warm_up():
+    """Compile (or load from cache) the kernel before the first frame arrives"""
+    postprocess(np.zeros((1, 4), dtype=np.float32), np.zeros((1, 1), dtype=np.float32), 0.5)